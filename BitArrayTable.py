@@ -0,0 +1,91 @@
+import struct
+from array import array
+from typing import Iterable, Iterator
+
+from BitArray import BitArray, _to_packed
+
+
+#Many equal-length bit rows stored back to back in one BitArray, each row starting on a byte boundary.
+#Rows are returned as zero-copy BitArray views (fixed size, writes go to the table), so a million 64-bit rows cost
+#8 MB instead of a million objects; column operations run over the whole buffer at once.
+class BitArrayTable:
+
+    def __init__(self, num_rows: int, row_bits: int):
+        if num_rows < 0 or row_bits <= 0:
+            raise ValueError("num_rows must be non-negative and row_bits positive")
+        self.num_rows = num_rows
+        self.row_bits = row_bits
+        self.row_bytes = (row_bits + 7) // 8
+        self.bits = BitArray(num_rows * self.row_bytes * 8)
+
+    #Table holding the given rows (any BitArray source of exactly row_bits bits each).
+    @classmethod
+    def from_rows(cls, rows: Iterable, row_bits: int) -> 'BitArrayTable':
+        rows = list(rows)
+        table = cls(len(rows), row_bits)
+        for i, row in enumerate(rows):
+            table[i] = row
+        return table
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def _check_row(self, i):
+        if i < 0:
+            i += self.num_rows
+        if not (0 <= i < self.num_rows):
+            raise IndexError("Row index out of range")
+        return i
+
+    #Row i as a BitArray view over the table's buffer. The table cannot be resized while views are alive.
+    def __getitem__(self, i: int) -> BitArray:
+        i = self._check_row(i)
+        start = i * self.row_bytes
+        return BitArray.frombuffer(self.bits.getbuffer()[start:start + self.row_bytes], self.row_bits)
+
+    #Overwrite row i with a bit source of exactly row_bits bits.
+    def __setitem__(self, i: int, value) -> None:
+        i = self._check_row(i)
+        data, nbits = _to_packed(value)
+        if nbits != self.row_bits:
+            raise ValueError(f"Row must have {self.row_bits} bits, got {nbits}")
+        self.bits[i * self.row_bytes * 8:i * self.row_bytes * 8 + nbits] = BitArray(data, length=nbits)
+
+    def __iter__(self) -> Iterator[BitArray]:
+        for i in range(self.num_rows):
+            yield self[i]
+
+    #Rows as integers (row bit 0 is the most significant bit), unpacked from the buffer in one pass.
+    def _row_ints(self):
+        unused = self.row_bytes * 8 - self.row_bits
+        with self.bits.getbuffer() as view:
+            for (data,) in struct.iter_unpack('%ds' % self.row_bytes, view):
+                yield int.from_bytes(data, 'big') >> unused
+
+    #Number of 1 bits in every row.
+    def popcounts(self) -> array:
+        return array('Q', (value.bit_count() for value in self._row_ints()))
+
+    #Column j (bit j of every row) as a BitArray of num_rows bits, gathered with one stepped slice.
+    def column(self, j: int) -> BitArray:
+        if not (0 <= j < self.row_bits):
+            raise IndexError("Column index out of range")
+        return self.bits[j::self.row_bytes * 8]
+
+    #Set column j of every row to value (0/1), or to the bits of a num_rows-bit source.
+    def set_column(self, j: int, value) -> None:
+        if not (0 <= j < self.row_bits):
+            raise IndexError("Column index out of range")
+        self.bits[j::self.row_bytes * 8] = value
+
+    #Number of rows with bit j set.
+    def column_count(self, j: int) -> int:
+        return self.column(j).count_ones()
+
+    #Indices of the rows that have every bit of mask (a row_bits-bit source) set.
+    def rows_with(self, mask) -> array:
+        data, nbits = _to_packed(mask)
+        if nbits != self.row_bits:
+            raise ValueError(f"Mask must have {self.row_bits} bits, got {nbits}")
+        want = BitArray(data, length=nbits)._read_word(0, nbits)
+        return array('Q', (i for i, value in enumerate(self._row_ints()) if value & want == want))
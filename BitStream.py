@@ -0,0 +1,233 @@
+from typing import Optional
+
+from BitArray import BitArray
+
+#Bits collected in the writer's integer accumulator before they are appended to the target in one go.
+_WRITER_FLUSH_BITS = 4096
+
+#Bytes written to (or read from) a file object per call.
+_FILE_CHUNK_BYTES = 1 << 16
+
+#Bytes moved from the source into the reader's integer window per refill.
+_READER_REFILL_BYTES = 512
+
+
+#Appends n-bit integers and variable-length codes to a BitArray or a binary file object, MSB first (the same bit
+#order as BitArray). Codes are packed into an integer accumulator and written out a few thousand bits at a time.
+#Call flush() (or close(), or use a with block) to push out the buffered bits; a file target is then padded with
+#0 bits to a whole byte, so record bits_written (which excludes the padding) if the exact length matters.
+class BitWriter:
+
+    def __init__(self, target=None):
+        self.target = BitArray(0) if target is None else target
+        self._to_file = not isinstance(self.target, BitArray)
+        self._acc = 0
+        self._acc_bits = 0
+        self._out = bytearray()
+        self.bits_written = 0
+
+    #Write the low nbits bits of value.
+    def write(self, value: int, nbits: int) -> None:
+        if nbits < 0 or value < 0 or value >> nbits:
+            raise ValueError(f"{value} does not fit in {nbits} bits")
+        self._acc = (self._acc << nbits) | value
+        self._acc_bits += nbits
+        self.bits_written += nbits
+        if self._acc_bits >= _WRITER_FLUSH_BITS:
+            self._drain()
+
+    def write_bit(self, bit: int) -> None:
+        if bit not in (0, 1):
+            raise ValueError("Bit value must be 0 or 1")
+        self.write(bit, 1)
+
+    #Unary code of n >= 0: n 1 bits followed by a 0.
+    def write_unary(self, n: int) -> None:
+        if n < 0:
+            raise ValueError("Unary code requires n >= 0")
+        self.write(((1 << n) - 1) << 1, n + 1)
+
+    #Elias gamma code of n >= 1: bit_length(n) - 1 zeros, then n in binary.
+    def write_gamma(self, n: int) -> None:
+        if n < 1:
+            raise ValueError("Elias gamma code requires n >= 1")
+        self.write(n, 2 * n.bit_length() - 1)
+
+    #Golomb-Rice code of n >= 0 with parameter k: n >> k in unary, then the low k bits of n.
+    def write_rice(self, n: int, k: int) -> None:
+        if n < 0 or k < 0:
+            raise ValueError("Rice code requires n >= 0 and k >= 0")
+        self.write_unary(n >> k)
+        self.write(n & ((1 << k) - 1), k)
+
+    #Write every bit of a BitArray.
+    def write_bits(self, bits: BitArray) -> None:
+        if self._acc_bits:
+            self._drain()
+        if self._to_file:
+            for pos in range(0, bits.size, _WRITER_FLUSH_BITS):
+                n = min(_WRITER_FLUSH_BITS, bits.size - pos)
+                self.write(bits._read_word(pos, n), n)
+        else:
+            self.target.extend(bits)
+            self.bits_written += bits.size
+
+    #Move the accumulator to the target: all of it for a BitArray, whole bytes only for a file.
+    def _drain(self):
+        if not self._to_file:
+            self.target._append_word(self._acc, self._acc_bits)
+            self._acc, self._acc_bits = 0, 0
+            return
+        keep = self._acc_bits % 8
+        nbytes = self._acc_bits // 8
+        self._out += (self._acc >> keep).to_bytes(nbytes, 'big')
+        self._acc &= (1 << keep) - 1
+        self._acc_bits = keep
+        if len(self._out) >= _FILE_CHUNK_BYTES:
+            self.target.write(self._out)
+            self._out = bytearray()
+
+    #Push everything out; a file target gets its last partial byte padded with 0 bits.
+    def flush(self) -> None:
+        if self._acc_bits:
+            self._drain()
+        if self._to_file:
+            if self._acc_bits:
+                pad = 8 - self._acc_bits
+                self._out += (self._acc << pad).to_bytes(1, 'big')
+                self._acc, self._acc_bits = 0, 0
+            if self._out:
+                self.target.write(self._out)
+                self._out = bytearray()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'BitWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
+
+#Cursor over a BitArray (from bit start) or a binary file object (from its current position) that reads n-bit
+#integers and the codes written by BitWriter. Source bytes are pulled into an integer window a chunk at a time, so
+#no slices or strings are built. nbits limits how many bits may be read (default: to the end of the BitArray, or to
+#EOF for files, including any padding bits BitWriter added to the last byte).
+class BitReader:
+
+    def __init__(self, source, start: int = 0, nbits: Optional[int] = None):
+        self.source = source
+        if isinstance(source, BitArray):
+            if not (0 <= start <= source.size):
+                raise IndexError("Bit index out of range")
+            available = source.size - start
+        else:
+            if start != 0:
+                raise ValueError("start is only supported for BitArray sources")
+            available = None
+        if nbits is not None:
+            if nbits < 0 or (available is not None and nbits > available):
+                raise ValueError("nbits must be between 0 and the number of available bits")
+            available = nbits
+        self._left = available
+        self._byte_pos = start // 8
+        self._window = 0
+        self._window_bits = 0
+        self._pending = b''
+        self._pending_pos = 0
+        self.position = 0
+        #Drop the bits of the first byte that come before start.
+        if start % 8:
+            self._refill()
+            self._window_bits -= start % 8
+            self._window &= (1 << self._window_bits) - 1
+
+    #Append the next chunk of source bytes to the window; False at the end of the source.
+    def _refill(self):
+        if isinstance(self.source, BitArray):
+            end = min(self._byte_pos + _READER_REFILL_BYTES, (self.source.size + 7) // 8)
+            chunk = self.source.byte_array[self._byte_pos:end]
+        else:
+            if self._pending_pos >= len(self._pending):
+                self._pending = self.source.read(_FILE_CHUNK_BYTES)
+                self._pending_pos = 0
+            chunk = self._pending[self._pending_pos:self._pending_pos + _READER_REFILL_BYTES]
+            self._pending_pos += len(chunk)
+        if not chunk:
+            return False
+        self._byte_pos += len(chunk)
+        self._window = (self._window << (8 * len(chunk))) | int.from_bytes(chunk, 'big')
+        self._window_bits += 8 * len(chunk)
+        return True
+
+    #Make at least n bits available in the window.
+    def _ensure(self, n):
+        if self._left is not None and n > self._left:
+            raise EOFError("Not enough bits left in the source")
+        while self._window_bits < n:
+            if not self._refill():
+                raise EOFError("Not enough bits left in the source")
+
+    def _take(self, n):
+        self._window_bits -= n
+        value = self._window >> self._window_bits
+        self._window &= (1 << self._window_bits) - 1
+        if self._left is not None:
+            self._left -= n
+        self.position += n
+        return value
+
+    #Read an nbits-bit unsigned integer.
+    def read(self, nbits: int) -> int:
+        if nbits < 0:
+            raise ValueError("nbits must be non-negative")
+        self._ensure(nbits)
+        return self._take(nbits)
+
+    def read_bit(self) -> int:
+        return self.read(1)
+
+    #Window bits that may still be consumed (the window can run past nbits).
+    def _usable(self):
+        return self._window_bits if self._left is None else min(self._window_bits, self._left)
+
+    #Count and consume a run of bit values equal to bit, stopping before the first other bit.
+    def _run(self, bit):
+        run = 0
+        while True:
+            usable = self._usable()
+            if usable == 0:
+                if (self._left is not None and self._left == 0) or not self._refill():
+                    raise EOFError("Not enough bits left in the source")
+                continue
+            top = self._window >> (self._window_bits - usable)
+            if bit:
+                top ^= (1 << usable) - 1
+            if top == 0:
+                self._take(usable)
+                run += usable
+                continue
+            length = usable - top.bit_length()
+            self._take(length)
+            return run + length
+
+    #Unary code: the number of 1 bits before the terminating 0.
+    def read_unary(self) -> int:
+        n = self._run(1)
+        self.read(1)
+        return n
+
+    #Elias gamma code.
+    def read_gamma(self) -> int:
+        zeros = self._run(0)
+        return self.read(zeros + 1)
+
+    #Golomb-Rice code with parameter k.
+    def read_rice(self, k: int) -> int:
+        q = self.read_unary()
+        return (q << k) | self.read(k)
+
+    #Bits that can still be read, or None for a file source without an nbits limit.
+    def bits_left(self) -> Optional[int]:
+        return self._left
@@ -0,0 +1,222 @@
+import hashlib
+import math
+import struct
+from typing import Iterable, List, Union
+
+from BitArray import BitArray
+
+#Serialized filter: header = number of bits, number of hash functions (little-endian), then the packed bits.
+_BLOOM_HEADER = struct.Struct('<QI')
+
+#Bits per counter in CountingBloomFilter; counters saturate at the maximum and are then never decremented.
+_COUNTER_BITS = 4
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+
+#Number of bits m and hash functions k for capacity items at the target false-positive rate:
+#m = -n ln p / (ln 2)^2, k = (m / n) ln 2.
+def _optimal_params(capacity, error_rate):
+    if capacity <= 0:
+        raise ValueError("capacity must be positive")
+    if not (0 < error_rate < 1):
+        raise ValueError("error_rate must be between 0 and 1")
+    num_bits = max(1, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+    num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+    return num_bits, num_hashes
+
+
+#Item as bytes for hashing: bytes-like objects as they are, str as UTF-8.
+def _item_bytes(item):
+    if isinstance(item, str):
+        return item.encode('utf-8')
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        return item
+    raise TypeError("Bloom filter items must be str or bytes-like")
+
+
+#The k bit positions of an item: double hashing h1 + i * h2 (mod m) from the two halves of one blake2b digest.
+def _positions(item, num_hashes, num_bits):
+    digest = hashlib.blake2b(_item_bytes(item), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+
+#Bloom filter over a BitArray. Membership tests can give false positives (at about error_rate once capacity items
+#have been added) but never false negatives.
+class BloomFilter:
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.num_bits, self.num_hashes = _optimal_params(capacity, error_rate)
+        self.bits = BitArray(self.num_bits)
+
+    #Filter with explicit geometry, optionally over existing bits.
+    @classmethod
+    def from_params(cls, num_bits: int, num_hashes: int, bits: BitArray = None) -> 'BloomFilter':
+        if num_bits <= 0 or num_hashes <= 0:
+            raise ValueError("num_bits and num_hashes must be positive")
+        if bits is not None and len(bits) != num_bits:
+            raise ValueError(f"Expected {num_bits} bits, got {len(bits)}")
+        bf = cls.__new__(cls)
+        bf.num_bits, bf.num_hashes = num_bits, num_hashes
+        bf.bits = bits if bits is not None else BitArray(num_bits)
+        return bf
+
+    def add(self, item: Union[str, bytes]) -> None:
+        self.bits.set_many(_positions(item, self.num_hashes, self.num_bits))
+
+    #Add every item with a single bulk write of all their bit positions.
+    def add_many(self, items: Iterable[Union[str, bytes]]) -> None:
+        positions = []
+        for item in items:
+            positions.extend(_positions(item, self.num_hashes, self.num_bits))
+        self.bits.set_many(positions)
+
+    def __contains__(self, item) -> bool:
+        return self.bits.get_many(_positions(item, self.num_hashes, self.num_bits)).all()
+
+    #Membership of every item, from a single bulk read of all their bit positions.
+    def contains_many(self, items: Iterable[Union[str, bytes]]) -> List[bool]:
+        k = self.num_hashes
+        positions = []
+        for item in items:
+            positions.extend(_positions(item, k, self.num_bits))
+        found = self.bits.get_many(positions)
+        return [found.all(i, i + k) for i in range(0, len(positions), k)]
+
+    #Estimated number of distinct items added: -(m / k) ln(1 - X / m) for X set bits.
+    def approximate_count(self) -> float:
+        ones = self.bits.count_ones()
+        if ones == self.num_bits:
+            return math.inf
+        return -self.num_bits / self.num_hashes * math.log(1 - ones / self.num_bits)
+
+    def _check_compatible(self, other):
+        if not isinstance(other, BloomFilter):
+            raise TypeError("Bloom filters can only be combined with Bloom filters")
+        if (self.num_bits, self.num_hashes) != (other.num_bits, other.num_hashes):
+            raise ValueError("Bloom filters must have the same num_bits and num_hashes")
+
+    #Union: contains everything either filter contains.
+    def __or__(self, other: 'BloomFilter') -> 'BloomFilter':
+        self._check_compatible(other)
+        return self.from_params(self.num_bits, self.num_hashes, self.bits | other.bits)
+
+    #Intersection: may report more false positives than a filter built from the common items.
+    def __and__(self, other: 'BloomFilter') -> 'BloomFilter':
+        self._check_compatible(other)
+        return self.from_params(self.num_bits, self.num_hashes, self.bits & other.bits)
+
+    def __ior__(self, other: 'BloomFilter') -> 'BloomFilter':
+        self._check_compatible(other)
+        self.bits |= other.bits
+        return self
+
+    def __iand__(self, other: 'BloomFilter') -> 'BloomFilter':
+        self._check_compatible(other)
+        self.bits &= other.bits
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, BloomFilter):
+            return NotImplemented
+        return (self.num_bits, self.num_hashes) == (other.num_bits, other.num_hashes) and self.bits == other.bits
+
+    #Header with the geometry followed by BitArray.tobytes() of the bits.
+    def tobytes(self) -> bytes:
+        return _BLOOM_HEADER.pack(self.num_bits, self.num_hashes) + self.bits.tobytes()
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> 'BloomFilter':
+        if len(data) < _BLOOM_HEADER.size:
+            raise ValueError("Truncated Bloom filter data")
+        num_bits, num_hashes = _BLOOM_HEADER.unpack_from(data)
+        payload = data[_BLOOM_HEADER.size:]
+        if len(payload) != (num_bits + 7) // 8:
+            raise ValueError("Bloom filter data does not match its header")
+        return cls.from_params(num_bits, num_hashes, BitArray(payload, length=num_bits))
+
+    def to_hex(self) -> str:
+        return self.tobytes().hex()
+
+    @classmethod
+    def from_hex(cls, hex_str: str) -> 'BloomFilter':
+        try:
+            data = bytes.fromhex(hex_str)
+        except ValueError as e:
+            raise ValueError("Invalid hexadecimal string") from e
+        return cls.frombytes(data)
+
+
+#Bloom filter with 4-bit saturating counters (packed in a BitArray) instead of single bits, so items can be removed.
+class CountingBloomFilter:
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.num_bits, self.num_hashes = _optimal_params(capacity, error_rate)
+        self.counters = BitArray(self.num_bits * _COUNTER_BITS)
+
+    def _counter(self, position):
+        return self.counters._read_word(position * _COUNTER_BITS, _COUNTER_BITS)
+
+    def _set_counter(self, position, value):
+        self.counters._write_word(position * _COUNTER_BITS, value, _COUNTER_BITS)
+
+    def add(self, item: Union[str, bytes]) -> None:
+        for position in _positions(item, self.num_hashes, self.num_bits):
+            count = self._counter(position)
+            if count < _COUNTER_MAX:
+                self._set_counter(position, count + 1)
+
+    def add_many(self, items: Iterable[Union[str, bytes]]) -> None:
+        for item in items:
+            self.add(item)
+
+    #Remove an item previously added; raises ValueError if it is not (even approximately) present.
+    def remove(self, item: Union[str, bytes]) -> None:
+        positions = _positions(item, self.num_hashes, self.num_bits)
+        counts = [self._counter(position) for position in positions]
+        if not all(counts):
+            raise ValueError("Item not in CountingBloomFilter")
+        for position, count in zip(positions, counts):
+            if count < _COUNTER_MAX:
+                self._set_counter(position, count - 1)
+
+    def __contains__(self, item) -> bool:
+        return all(self._counter(position) for position in _positions(item, self.num_hashes, self.num_bits))
+
+    def contains_many(self, items: Iterable[Union[str, bytes]]) -> List[bool]:
+        return [item in self for item in items]
+
+    #Plain BloomFilter with a bit set wherever a counter is nonzero.
+    def to_bloom_filter(self) -> BloomFilter:
+        bits = BitArray(self.num_bits)
+        bits.set_many([i for i in range(self.num_bits) if self._counter(i)])
+        return BloomFilter.from_params(self.num_bits, self.num_hashes, bits)
+
+    #Header with the geometry followed by the packed counters.
+    def tobytes(self) -> bytes:
+        return _BLOOM_HEADER.pack(self.num_bits, self.num_hashes) + self.counters.tobytes()
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> 'CountingBloomFilter':
+        if len(data) < _BLOOM_HEADER.size:
+            raise ValueError("Truncated Bloom filter data")
+        num_bits, num_hashes = _BLOOM_HEADER.unpack_from(data)
+        payload = data[_BLOOM_HEADER.size:]
+        if len(payload) != (num_bits * _COUNTER_BITS + 7) // 8:
+            raise ValueError("Bloom filter data does not match its header")
+        cbf = cls.__new__(cls)
+        cbf.num_bits, cbf.num_hashes = num_bits, num_hashes
+        cbf.counters = BitArray(payload, length=num_bits * _COUNTER_BITS)
+        return cbf
+
+    def to_hex(self) -> str:
+        return self.tobytes().hex()
+
+    @classmethod
+    def from_hex(cls, hex_str: str) -> 'CountingBloomFilter':
+        try:
+            data = bytes.fromhex(hex_str)
+        except ValueError as e:
+            raise ValueError("Invalid hexadecimal string") from e
+        return cls.frombytes(data)
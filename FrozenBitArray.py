@@ -0,0 +1,74 @@
+from typing import Optional
+
+from BitArray import BitArray
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError("FrozenBitArray is immutable")
+
+
+#Immutable, hashable BitArray for dict keys and set members. The bits live in a bytes object (no spare capacity) and
+#the hash is computed once. Operators return plain BitArrays; in-place operators rebind to a new FrozenBitArray,
+#like += on a tuple. Equal to any BitArray with the same bits.
+class FrozenBitArray(BitArray):
+    __slots__ = ('_hash',)
+
+    def __init__(self, size_or_str=0, default_value=0, length=None):
+        source = BitArray(size_or_str, default_value, length)
+        self._rank_index = None
+        self._hash = None
+        self.size = source.size
+        self.byte_array = bytes(source.byte_array[:(source.size + 7) // 8])
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.size, self.tobytes()))
+        return self._hash
+
+    __setitem__ = __delitem__ = _immutable
+    setall = set_many = flip_many = set_range = fill = resize = clear = frombytes = _immutable
+    pop = remove = extend = insert = insert_bits = delete_range = shrink_to_fit = _immutable
+    invert = reverse = rotate = sort = _immutable
+
+    def __iand__(self, other):
+        return FrozenBitArray(self & other)
+
+    def __ior__(self, other):
+        return FrozenBitArray(self | other)
+
+    def __ixor__(self, other):
+        return FrozenBitArray(self ^ other)
+
+    def __ilshift__(self, n):
+        return FrozenBitArray(self << n)
+
+    def __irshift__(self, n):
+        return FrozenBitArray(self >> n)
+
+    def __iadd__(self, other):
+        return FrozenBitArray(self + other)
+
+    def __imul__(self, n):
+        return FrozenBitArray(self * n)
+
+    #Alternate constructors build a BitArray and freeze a copy of it, so the bits never alias outside storage.
+    @classmethod
+    def load(cls, fileobj) -> 'FrozenBitArray':
+        return cls(BitArray.load(fileobj))
+
+    @classmethod
+    def frombuffer(cls, buf, nbits: Optional[int] = None) -> 'FrozenBitArray':
+        return cls(BitArray.frombuffer(buf, nbits))
+
+    @classmethod
+    def open(cls, path, size: Optional[int] = None, mode: str = 'r') -> 'FrozenBitArray':
+        with BitArray.open(path, size, mode) as ba:
+            return cls(ba)
+
+    @classmethod
+    def from_numpy(cls, arr, nbits: Optional[int] = None, copy: bool = True) -> 'FrozenBitArray':
+        return cls(BitArray.from_numpy(arr, nbits))
+
+    @classmethod
+    def from_hex(cls, hex_str: str) -> 'FrozenBitArray':
+        return cls(BitArray.from_hex(hex_str))
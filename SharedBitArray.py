@@ -0,0 +1,223 @@
+import multiprocessing
+import operator
+import os
+import struct
+import sys
+from multiprocessing import shared_memory
+from typing import Optional, Sequence
+
+from BitArray import BitArray
+
+#Shared block layout: header = magic, number of lock stripes, bit length (little-endian), then the packed bits.
+_SHARED_MAGIC = b'BITS'
+_SHARED_HEADER = struct.Struct('<4sIQ')
+
+#Bytes guarded by one lock stripe; stripe of a byte = (byte_index // _STRIPE_BYTES) % number of stripes.
+_STRIPE_BYTES = 4096
+
+_DEFAULT_STRIPES = 64
+
+#Whether this process's resource tracker was inherited through fork (set in the child, see _own_tracker).
+_forked_tracker = False
+
+
+def _after_fork():
+    global _forked_tracker
+    try:
+        from multiprocessing import resource_tracker
+        _forked_tracker = resource_tracker._resource_tracker._fd is not None
+    except (ImportError, AttributeError):
+        pass
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+#Whether registering a block now goes to a resource tracker that belongs to this process alone. Before 3.13 that is
+#the case when no tracker is running yet (one is started for us) or when this process started it. Spawn, forkserver and
+#fork children share their parent's tracker instead (spawn passes only its fd, fork copies it), and that tracker holds
+#the creator's registration, which must not be removed.
+def _own_tracker():
+    try:
+        from multiprocessing import resource_tracker
+        tracker = resource_tracker._resource_tracker
+        return tracker._fd is None or (tracker._pid is not None and not _forked_tracker)
+    except (ImportError, AttributeError):
+        return False
+
+
+#BitArray stored in a multiprocessing.shared_memory block that any process can attach to by name.
+#Writers are serialized by striped locks (one lock per 4 KiB region, modulo the number of stripes), so concurrent
+#__setitem__, set_many, flip_many, set_range, test_and_set, fetch_or and merge/|= calls never lose updates,
+#from threads or processes. Pure Python has no compare-and-swap on shared memory, so locks take its place.
+#Other in-place whole-array operations (invert, shifts, &=, ...) are not synchronized with concurrent writers.
+#The locks are multiprocessing.Lock objects, which can only be handed to other processes by inheritance:
+#pass the array through ProcessPoolExecutor(initializer=..., initargs=(shared,)) or Process(args=...), and create it
+#with the same multiprocessing context (ctx=) as that pool or process.
+class SharedBitArray(BitArray):
+
+    #Create a new zero-filled shared array of size bits (name is generated if None). The locks come from ctx (a
+    #multiprocessing context, e.g. get_context('spawn')); pass the context the worker pool is built on.
+    @classmethod
+    def create(cls, size: int, name: Optional[str] = None, stripes: int = _DEFAULT_STRIPES, ctx=None) -> 'SharedBitArray':
+        if size < 0:
+            raise ValueError("Size must be a non-negative integer.")
+        if stripes < 1:
+            raise ValueError("stripes must be positive")
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_SHARED_HEADER.size + max(1, (size + 7) // 8))
+        _SHARED_HEADER.pack_into(shm.buf, 0, _SHARED_MAGIC, stripes, size)
+        if ctx is None:
+            ctx = multiprocessing.get_context()
+        return cls._wrap(shm, size, tuple(ctx.Lock() for _ in range(stripes)))
+
+    #Attach to an existing shared array by name, using the creator's locks (received by inheritance).
+    @classmethod
+    def attach(cls, name: str, locks: Sequence) -> 'SharedBitArray':
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            #Before 3.13 every attaching process registers the block. A tracker of its own would unlink it when this
+            #process exits, so that registration is withdrawn; a tracker shared with the creator keeps its entry.
+            own = _own_tracker()
+            shm = shared_memory.SharedMemory(name=name)
+            if own:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, 'shared_memory')
+        magic, stripes, size = _SHARED_HEADER.unpack_from(shm.buf, 0)
+        if magic != _SHARED_MAGIC:
+            shm.close()
+            raise ValueError("Not a SharedBitArray block")
+        if len(locks) != stripes:
+            shm.close()
+            raise ValueError(f"Expected {stripes} locks, got {len(locks)}")
+        return cls._wrap(shm, size, tuple(locks))
+
+    @classmethod
+    def _wrap(cls, shm, size, locks):
+        ba = cls(0)
+        ba._shm = shm
+        ba._locks = locks
+        ba.byte_array = shm.buf[_SHARED_HEADER.size:]
+        ba.size = size
+        return ba
+
+    #Name to attach to from other processes.
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    #Re-attach by name in the receiving process (only valid while spawning, because of the locks).
+    def __reduce__(self):
+        return (self.__class__.attach, (self._shm.name, self._locks))
+
+    #Detach this process from the block; the array is left empty.
+    def close(self) -> None:
+        self.byte_array.release()
+        self.byte_array = bytearray()
+        self.size = 0
+        self._shm.close()
+
+    #Free the block once every process has closed it (call once, from the creator).
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+    #Locks guarding bytes [first_byte, last_byte], in stripe order so that multi-stripe holders cannot deadlock.
+    def _stripe_locks(self, first_byte, last_byte):
+        count = len(self._locks)
+        first, last = first_byte // _STRIPE_BYTES, last_byte // _STRIPE_BYTES
+        if last - first + 1 >= count:
+            return self._locks
+        return [self._locks[i] for i in sorted({region % count for region in range(first, last + 1)})]
+
+    #Run func(*args) while holding the locks for bytes [first_byte, last_byte].
+    def _locked(self, first_byte, last_byte, func, *args):
+        locks = self._stripe_locks(first_byte, last_byte)
+        for lock in locks:
+            lock.acquire()
+        try:
+            return func(*args)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    #Atomic single-bit (or slice) assignment.
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            r = range(*index.indices(self.size))
+            if len(r) == 0:
+                return BitArray.__setitem__(self, index, value)
+            first_byte, last_byte = min(r[0], r[-1]) // 8, max(r[0], r[-1]) // 8
+        else:
+            #Normalize integer-like indices (e.g. numpy.int64) so they lock the stripe they actually write to.
+            index = operator.index(index)
+            first_byte = last_byte = index // 8
+        self._locked(first_byte, last_byte, BitArray.__setitem__, self, index, value)
+
+    #Set bit index to 1 and return its previous value, atomically.
+    def test_and_set(self, index: int) -> int:
+        return self.fetch_or(index, 1)
+
+    #OR value into bit index and return its previous value, atomically.
+    def fetch_or(self, index: int, value: int = 1) -> int:
+        if value not in (0, 1):
+            raise ValueError("Bit value must be 0 or 1")
+        index = operator.index(index)
+        byte_index = index // 8
+        return self._locked(byte_index, byte_index, self._fetch_or, index, value)
+
+    def _fetch_or(self, index, value):
+        old = self[index]
+        if value and not old:
+            BitArray.__setitem__(self, index, 1)
+        return old
+
+    #Batch scatter; indices are grouped by stripe so each lock is taken once per call.
+    def set_many(self, indices, value: int = 1) -> None:
+        if isinstance(indices, range) and abs(indices.step) == 1:
+            #Contiguous ranges go through set_range, which does its own locking.
+            return BitArray.set_many(self, indices, value)
+        if value not in (0, 1):
+            raise ValueError("Bit value must be 0 or 1")
+        self._per_stripe(indices, BitArray.set_many, value)
+
+    #Batch flip; indices are grouped by stripe so each lock is taken once per call.
+    def flip_many(self, indices) -> None:
+        self._per_stripe(indices, BitArray.flip_many)
+
+    def _per_stripe(self, indices, method, *args):
+        count = len(self._locks)
+        groups = {}
+        for i in self._batch_indices(indices):
+            groups.setdefault((i // 8 // _STRIPE_BYTES) % count, []).append(i)
+        for stripe in sorted(groups):
+            with self._locks[stripe]:
+                method(self, groups[stripe], *args)
+
+    #Atomic byte-level fill of [start, stop).
+    def set_range(self, start: int, stop: int, value: int = 1) -> None:
+        if not (0 <= start <= stop <= self.size):
+            raise IndexError("Bit index out of range")
+        if start < stop:
+            self._locked(start // 8, (stop - 1) // 8, BitArray.set_range, self, start, stop, value)
+
+    #OR private BitArrays (e.g. per-worker results) into the shared array in bulk: one stripe region at a time,
+    #each combined as a big integer under its lock. Bits beyond this array's length are ignored.
+    def merge(self, *others: BitArray) -> None:
+        for other in others:
+            if not isinstance(other, BitArray):
+                raise TypeError("Bitwise OR is only supported between BitArray instances")
+            size = min(self.size, other.size)
+            step = _STRIPE_BYTES * 8
+            for pos in range(0, size, step):
+                n = min(step, size - pos)
+                self._locked(pos // 8, (pos + n - 1) // 8, self._merge_region, other, pos, n)
+
+    def _merge_region(self, other, pos, n):
+        value = self._read_word(pos, n) | other._read_word(pos, n)
+        self._write_word(pos, value, n)
+
+    #In-place |= with another BitArray is an atomic merge.
+    def __ior__(self, other):
+        self.merge(other)
+        return self
@@ -0,0 +1,392 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable
+
+from BitArray import BitArray
+
+#Bits per chunk: an index is split into a chunk key (index >> 16) and a 16-bit offset inside the chunk.
+_CHUNK_BITS = 1 << 16
+
+#Array containers hold at most this many offsets; beyond it a bitmap (8 KiB) is never larger.
+_ARRAY_MAX = 4096
+
+#Container kinds. A container is a (kind, data) tuple where data is
+#  _ARRAY:  sorted array('H') of the set offsets,
+#  _BITMAP: BitArray of _CHUNK_BITS bits,
+#  _RUN:    array('H') of inclusive runs flattened as [start0, last0, start1, last1, ...].
+_ARRAY = 'array'
+_BITMAP = 'bitmap'
+_RUN = 'run'
+
+
+#Number of set bits in a container.
+def _cardinality(container):
+    kind, data = container
+    if kind == _ARRAY:
+        return len(data)
+    if kind == _BITMAP:
+        return data.count_ones()
+    return sum(data[i + 1] - data[i] + 1 for i in range(0, len(data), 2))
+
+
+#Number of runs of consecutive set bits in a container.
+def _run_count(container):
+    kind, data = container
+    if kind == _ARRAY:
+        return sum(1 for i in range(len(data)) if i == 0 or data[i - 1] + 1 != data[i])
+    if kind == _BITMAP:
+        return (data & ~(data >> 1)).count_ones()
+    return len(data) // 2
+
+
+#Test one offset without expanding the container.
+def _contains(container, offset):
+    kind, data = container
+    if kind == _ARRAY:
+        i = bisect_left(data, offset)
+        return i < len(data) and data[i] == offset
+    if kind == _BITMAP:
+        return data[offset] == 1
+    i = bisect_right(data, offset)
+    return i % 2 == 1 or (i > 0 and data[i - 1] == offset)
+
+
+#Sorted set offsets of a container.
+def _offsets(container):
+    kind, data = container
+    if kind == _ARRAY:
+        return data
+    if kind == _BITMAP:
+        return array('H', data.iter_set())
+    return array('H', (v for i in range(0, len(data), 2) for v in range(data[i], data[i + 1] + 1)))
+
+
+#Offsets of the set bits of a _CHUNK_BITS-bit word (offset 0 = most significant bit), skipping zero bytes.
+def _set_offsets(word):
+    return array('H', BitArray(word.to_bytes(_CHUNK_BITS // 8, 'big'), length=_CHUNK_BITS).iter_set())
+
+
+#Inclusive runs of a container as a flat array('H').
+def _runs(container):
+    kind, data = container
+    if kind == _RUN:
+        return data
+    if kind == _BITMAP:
+        #Offset i is bit _CHUNK_BITS - 1 - i of word, so >> 1 lines each bit up with its left neighbour and << 1
+        #with its right one: run starts have no set bit before them, run ends none after.
+        word = int.from_bytes(data.tobytes(), 'big')
+        full = (1 << _CHUNK_BITS) - 1
+        starts = _set_offsets(word & ~(word >> 1))
+        ends = _set_offsets(word & ~(word << 1) & full)
+        runs = array('H', bytes(4 * len(starts)))
+        runs[0::2] = starts
+        runs[1::2] = ends
+        return runs
+    runs = array('H')
+    for i, offset in enumerate(data):
+        if i and data[i - 1] + 1 == offset:
+            runs[-1] = offset
+        else:
+            runs.extend((offset, offset))
+    return runs
+
+
+#Dense bitmap of a container (the bitmap itself for bitmap containers, so callers must not modify it).
+def _bitmap(container):
+    kind, data = container
+    if kind == _BITMAP:
+        return data
+    bitmap = BitArray(_CHUNK_BITS)
+    if kind == _ARRAY:
+        bitmap.set_many(data)
+    else:
+        for i in range(0, len(data), 2):
+            bitmap[data[i]:data[i + 1] + 1] = 1
+    return bitmap
+
+
+#Re-encode a container with whichever of array (2 bytes per bit), bitmap (8 KiB) or runs (4 bytes per run)
+#is smallest; None if it is empty.
+def _best(container, allow_runs=True):
+    cardinality = _cardinality(container)
+    if cardinality == 0:
+        return None
+    sizes = [(2 * cardinality, _ARRAY), (_CHUNK_BITS // 8, _BITMAP)]
+    if allow_runs:
+        sizes.append((4 * _run_count(container), _RUN))
+    kind = min(sizes)[1]
+    if kind == container[0]:
+        return container
+    if kind == _ARRAY:
+        return (_ARRAY, array('H', _offsets(container)))
+    if kind == _BITMAP:
+        return (_BITMAP, _bitmap(container).copy())
+    return (_RUN, array('H', _runs(container)))
+
+
+#Independent copy of a container.
+def _copy(container):
+    kind, data = container
+    return (kind, data.copy() if kind == _BITMAP else array('H', data))
+
+
+#Intersection of two flat run lists.
+def _and_runs(a, b):
+    result = array('H')
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start, last = max(a[i], b[j]), min(a[i + 1], b[j + 1])
+        if start <= last:
+            result.extend((start, last))
+        if a[i + 1] < b[j + 1]:
+            i += 2
+        else:
+            j += 2
+    return result
+
+
+#Union of two flat run lists.
+def _or_runs(a, b):
+    pairs = sorted([(a[i], a[i + 1]) for i in range(0, len(a), 2)] + [(b[i], b[i + 1]) for i in range(0, len(b), 2)])
+    result = array('H')
+    for start, last in pairs:
+        if result and start <= result[-1] + 1:
+            result[-1] = max(result[-1], last)
+        else:
+            result.extend((start, last))
+    return result
+
+
+#AND of two containers: array results are filtered, runs are intersected, anything else goes through 8 KiB bitmaps.
+def _and(a, b):
+    if a[0] != _ARRAY and b[0] == _ARRAY:
+        a, b = b, a
+    if a[0] == _ARRAY:
+        return _best((_ARRAY, array('H', (v for v in a[1] if _contains(b, v)))))
+    if a[0] == _RUN and b[0] == _RUN:
+        return _best((_RUN, _and_runs(a[1], b[1])))
+    return _best((_BITMAP, _bitmap(a) & _bitmap(b)))
+
+
+#OR of two containers.
+def _or(a, b):
+    if a[0] == _ARRAY and b[0] == _ARRAY and len(a[1]) + len(b[1]) <= _ARRAY_MAX:
+        return _best((_ARRAY, array('H', sorted(set(a[1]) | set(b[1])))))
+    if a[0] == _RUN and b[0] == _RUN:
+        return _best((_RUN, _or_runs(a[1], b[1])))
+    return _best((_BITMAP, _bitmap(a) | _bitmap(b)))
+
+
+#XOR of two containers.
+def _xor(a, b):
+    if a[0] == _ARRAY and b[0] == _ARRAY:
+        return _best((_ARRAY, array('H', sorted(set(a[1]) ^ set(b[1])))))
+    return _best((_BITMAP, _bitmap(a) ^ _bitmap(b)))
+
+
+#Compressed bit array for mostly-empty (or mostly-run) bitmaps, with the same core API as BitArray.
+#The index space is split into 2^16-bit chunks and only non-empty chunks are stored, each as a sorted array of
+#offsets, a dense BitArray bitmap or a list of runs, whichever is smallest (Roaring bitmap layout).
+class SparseBitArray:
+    def __init__(self, size: int):
+        if size < 0:
+            raise ValueError("Size must be a non-negative integer.")
+        self.size = size
+        self._chunks = {}
+        self._keys = []
+
+    #Build from a dense BitArray, skipping empty chunks; lossless.
+    @classmethod
+    def from_bitarray(cls, ba: BitArray) -> 'SparseBitArray':
+        sparse = cls(len(ba))
+        for start in range(0, len(ba), _CHUNK_BITS):
+            stop = min(start + _CHUNK_BITS, len(ba))
+            if ba.any(start, stop):
+                bitmap = ba[start:stop]
+                bitmap.resize(_CHUNK_BITS)
+                sparse._store(start >> 16, _best((_BITMAP, bitmap)))
+        return sparse
+
+    #Expand to a dense BitArray of the same size; lossless.
+    def to_bitarray(self) -> BitArray:
+        ba = BitArray(self.size)
+        for key in self._keys:
+            start = key << 16
+            stop = min(start + _CHUNK_BITS, self.size)
+            ba[start:stop] = _bitmap(self._chunks[key])[:stop - start]
+        return ba
+
+    #Store (or drop, for None) the container of a chunk, keeping the key list sorted.
+    def _store(self, key, container):
+        if container is None:
+            if key in self._chunks:
+                del self._chunks[key]
+                self._keys.pop(bisect_left(self._keys, key))
+            return
+        if key not in self._chunks:
+            insort(self._keys, key)
+        self._chunks[key] = container
+
+    def _check_index(self, index):
+        if not isinstance(index, int):
+            raise TypeError("Invalid index type")
+        if not (0 <= index < self.size):
+            raise IndexError("Bit index out of range")
+
+    #get value at some index i.e object[index]
+    def __getitem__(self, index: int) -> int:
+        self._check_index(index)
+        container = self._chunks.get(index >> 16)
+        return int(container is not None and _contains(container, index & 0xFFFF))
+
+    #set item for some index with value i.e object[index]=value
+    def __setitem__(self, index: int, value: int) -> None:
+        self._check_index(index)
+        if value not in (0, 1):
+            raise ValueError("Bit value must be 0 or 1")
+        key, offset = index >> 16, index & 0xFFFF
+        container = self._chunks.get(key)
+        if container is None:
+            if value:
+                self._store(key, (_ARRAY, array('H', [offset])))
+            return
+        if container[0] == _RUN:
+            container = _best(container, allow_runs=False)
+            self._chunks[key] = container
+        kind, data = container
+        if kind == _BITMAP:
+            data[offset] = value
+            if not value:
+                #Demote to an offset array (or drop the chunk) once few enough bits are left.
+                self._store(key, _best(container, allow_runs=False))
+            return
+        i = bisect_left(data, offset)
+        present = i < len(data) and data[i] == offset
+        if value and not present:
+            data.insert(i, offset)
+            if len(data) > _ARRAY_MAX:
+                self._chunks[key] = (_BITMAP, _bitmap(container))
+        elif not value and present:
+            del data[i]
+            if not data:
+                self._store(key, None)
+
+    #Returns the number of bits
+    def __len__(self) -> int:
+        return self.size
+
+    #Iterate over the indices of the set bits in increasing order.
+    def iter_set(self) -> Iterable[int]:
+        for key in self._keys:
+            base = key << 16
+            for offset in _offsets(self._chunks[key]):
+                yield base + offset
+
+    #Count 1 bits (sum of the container cardinalities).
+    def count_ones(self) -> int:
+        return sum(_cardinality(container) for container in self._chunks.values())
+
+    #Count 0 bits.
+    def count_zeros(self) -> int:
+        return self.size - self.count_ones()
+
+    #Find first occurrence of value (0 or 1).
+    def find_first(self, value: int) -> int:
+        if value not in (0, 1):
+            raise ValueError("Value must be 0 or 1")
+        if value:
+            for key in self._keys:
+                offsets = _offsets(self._chunks[key])
+                if len(offsets):
+                    return (key << 16) + offsets[0]
+        else:
+            for key in range((self.size + _CHUNK_BITS - 1) >> 16):
+                container = self._chunks.get(key)
+                if container is None:
+                    return key << 16
+                limit = min(_CHUNK_BITS, self.size - (key << 16))
+                bitmap = _bitmap(container)
+                if not bitmap.all(0, limit):
+                    return (key << 16) + bitmap.index(0, 0, limit)
+        raise ValueError(f"{value} not found in BitArray")
+
+    #Find last occurrence of value (0 or 1).
+    def find_last(self, value: int) -> int:
+        if value not in (0, 1):
+            raise ValueError("Value must be 0 or 1")
+        if value:
+            for key in reversed(self._keys):
+                offsets = _offsets(self._chunks[key])
+                if len(offsets):
+                    return (key << 16) + offsets[-1]
+        else:
+            for key in range(((self.size + _CHUNK_BITS - 1) >> 16) - 1, -1, -1):
+                limit = min(_CHUNK_BITS, self.size - (key << 16))
+                container = self._chunks.get(key)
+                if container is None:
+                    return (key << 16) + limit - 1
+                bitmap = _bitmap(container)
+                if not bitmap.all(0, limit):
+                    return (key << 16) + bitmap[:limit].find_last(0)
+        raise ValueError(f"{value} not found in BitArray")
+
+    #Dense bytes of the whole array, identical to BitArray.tobytes() of the expanded array.
+    def tobytes(self) -> bytes:
+        return self.to_bitarray().tobytes()
+
+    #Re-encode every chunk with its smallest representation, including runs (call after bulk single-bit edits).
+    def optimize(self) -> None:
+        for key in list(self._keys):
+            self._store(key, _best(self._chunks[key]))
+
+    #Combine chunk by chunk; the result has min(len) bits like BitArray's default (truncating) operators.
+    def _combine(self, other, op, name, keep_unmatched):
+        if not isinstance(other, SparseBitArray):
+            raise TypeError(f"Bitwise {name} is only supported between SparseBitArray instances")
+        result = SparseBitArray(min(self.size, other.size))
+        for key in set(self._keys) | set(other._keys):
+            a, b = self._chunks.get(key), other._chunks.get(key)
+            if a is not None and b is not None:
+                container = op(a, b)
+            elif keep_unmatched:
+                container = _copy(a if a is not None else b)
+            else:
+                continue
+            result._store(key, result._clip(key, container))
+        return result
+
+    #Drop offsets of a container that fall beyond the end of this array.
+    def _clip(self, key, container):
+        limit = self.size - (key << 16)
+        if container is None or limit >= _CHUNK_BITS:
+            return container
+        if limit <= 0:
+            return None
+        return _best((_ARRAY, array('H', (v for v in _offsets(container) if v < limit))))
+
+    #Enables use of the & operator (bitwise AND) between two SparseBitArray objects.
+    def __and__(self, other: 'SparseBitArray') -> 'SparseBitArray':
+        return self._combine(other, _and, "AND", keep_unmatched=False)
+
+    #Enables use of the | operator (bitwise OR) between two SparseBitArray objects.
+    def __or__(self, other: 'SparseBitArray') -> 'SparseBitArray':
+        return self._combine(other, _or, "OR", keep_unmatched=True)
+
+    #Enables use of the ^ operator (bitwise XOR) between two SparseBitArray objects.
+    def __xor__(self, other: 'SparseBitArray') -> 'SparseBitArray':
+        return self._combine(other, _xor, "XOR", keep_unmatched=True)
+
+    #Compare two sparse bit arrays for equality (independent of the chosen encodings).
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SparseBitArray):
+            return False
+        if self.size != other.size or self._keys != other._keys:
+            return False
+        for key in self._keys:
+            a, b = self._chunks[key], other._chunks[key]
+            if a[0] == b[0] and a[0] != _BITMAP:
+                if a[1] != b[1]:
+                    return False
+            elif _bitmap(a) != _bitmap(b):
+                return False
+        return True
@@ -0,0 +1,285 @@
+"""Benchmarks for BitArray.
+
+    python -m bitarray_bench                                  # default sizes and densities, table on stdout
+    python -m bitarray_bench --sizes 64 1M 1G --output new.json
+    python -m bitarray_bench --compare old.json --threshold 0.10
+    python -m bitarray_bench --filter search --filter count
+
+With --compare, every benchmark present in both runs is reported as faster, slower or unchanged, and the exit
+status is 1 if any got slower by more than the threshold (a fraction of the baseline time).
+"""
+import argparse
+import json
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+import timeit
+
+from BitArray import BitArray
+
+#Sizes accept K/M/G suffixes (powers of two): 64, 1M = 2**20 bits, 1G = 2**30 bits.
+_SUFFIXES = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+_DEFAULT_SIZES = ('64', '64K', '16M')
+_DEFAULT_DENSITIES = (0.0, 0.001, 0.5, 0.999)
+
+#Number of random indices touched by the element-wise benchmarks.
+_POINT_OPS = 1000
+
+_SHORT_PATTERN = '1011'
+
+#Lengths of the patterns planted at the end of the array for the search benchmarks: below and above the length at
+#which search switches from '0'/'1' string chunks to the byte prefilter.
+_SHORT_SEARCH_BITS = 14
+_LONG_SEARCH_BITS = 48
+
+#Long patterns made of one common byte value (0x00 runs at low density, 0xff runs at high density): the worst case for
+#the search byte prefilter, which has to fall back to string search instead of verifying a candidate at every byte.
+_ZERO_RUN_PATTERN = '0' * 24 + '1'
+_ONE_RUN_PATTERN = '1' * 24 + '0'
+
+
+def _parse_size(text):
+    match = re.fullmatch(r'(\d+)([KMG]?)', text.strip().upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size {text!r}")
+    return int(match.group(1)) * _SUFFIXES[match.group(2)]
+
+
+#Random BitArray of size bits with about density * size ones; sparse and dense arrays are built from a list of positions.
+def _random_bits(size, density, rnd):
+    if density == 0.5:
+        ba = BitArray(rnd.randbytes((size + 7) // 8), length=size)
+        return ba
+    minority = min(density, 1 - density)
+    ba = BitArray(size)
+    if size:
+        ba.set_many([rnd.randrange(size) for _ in range(int(size * minority))])
+    if density > 0.5:
+        ba.invert()
+    return ba
+
+
+#Copy of a whose last bits are replaced by tail, so a search for tail has to scan the whole array unless the pattern
+#happens to occur earlier (a random 14-bit tail occurs about every 16K bits at density 0.5, a 48-bit one never).
+def _planted(a, tail):
+    hay = a.copy()
+    n = min(len(tail), len(hay))
+    if n:
+        hay[len(hay) - n:] = tail[len(tail) - n:]
+    return hay, tail[len(tail) - n:] or '1'
+
+
+#Benchmark table: name -> function(a, b, indices) returning the callable to time. a and b are independent arrays of
+#the same size and density, indices is a list of _POINT_OPS random positions.
+def _benchmarks():
+    def construct_zeros(a, b, idx):
+        n = len(a)
+        return lambda: BitArray(n)
+
+    def construct_bytes(a, b, idx):
+        data, n = a.tobytes(), len(a)
+        return lambda: BitArray(data, length=n)
+
+    def getitem(a, b, idx):
+        return lambda: [a[i] for i in idx]
+
+    def setitem(a, b, idx):
+        def run():
+            for i in idx:
+                a[i] = 1
+        return run
+
+    def get_many(a, b, idx):
+        return lambda: a.get_many(idx)
+
+    def set_many(a, b, idx):
+        return lambda: a.set_many(idx)
+
+    def slice_contiguous(a, b, idx):
+        n = len(a)
+        return lambda: a[n // 3:2 * n // 3]
+
+    def slice_stepped(a, b, idx):
+        return lambda: a[::3]
+
+    def bitwise_and(a, b, idx):
+        return lambda: a & b
+
+    def bitwise_or(a, b, idx):
+        return lambda: a | b
+
+    def bitwise_xor(a, b, idx):
+        return lambda: a ^ b
+
+    def invert(a, b, idx):
+        return a.invert
+
+    def shift_left(a, b, idx):
+        return lambda: a << 3
+
+    def rotate(a, b, idx):
+        return lambda: a.rotate(5)
+
+    def search_short(a, b, idx):
+        hay, pattern = _planted(a, format(random.Random(1).getrandbits(_SHORT_SEARCH_BITS), '0%db' % _SHORT_SEARCH_BITS))
+        return lambda: hay.search(pattern)
+
+    def search_long(a, b, idx):
+        hay, pattern = _planted(a, format(random.Random(2).getrandbits(_LONG_SEARCH_BITS), '0%db' % _LONG_SEARCH_BITS))
+        return lambda: hay.search(pattern)
+
+    #Long pattern whose whole bytes are 0x00, the prefilter's worst case on sparse input: planted at the end.
+    def search_zero_core(a, b, idx):
+        hay, pattern = _planted(a, '0' * (_LONG_SEARCH_BITS - 2) + '11')
+        return lambda: hay.search(pattern)
+
+    def count_pattern(a, b, idx):
+        return lambda: a.count(_SHORT_PATTERN)
+
+    def count_zero_run(a, b, idx):
+        return lambda: a.count(_ZERO_RUN_PATTERN, overlapping=True)
+
+    def count_one_run(a, b, idx):
+        return lambda: a.count(_ONE_RUN_PATTERN, overlapping=True)
+
+    def popcount(a, b, idx):
+        return a.count_ones
+
+    def rank(a, b, idx):
+        a.rank(1, 0)
+        return lambda: [a.rank(1, i) for i in idx]
+
+    def iter_set(a, b, idx):
+        return lambda: sum(1 for _ in a.iter_set())
+
+    def dumps(a, b, idx):
+        return a.dumps
+
+    def loads(a, b, idx):
+        data = a.dumps()
+        return lambda: BitArray.loads(data)
+
+    def to_hex(a, b, idx):
+        return a.to_hex
+
+    return {f.__name__: f for f in (
+        construct_zeros, construct_bytes, getitem, setitem, get_many, set_many, slice_contiguous, slice_stepped,
+        bitwise_and, bitwise_or, bitwise_xor, invert, shift_left, rotate, search_short, search_long, search_zero_core,
+        count_pattern, count_zero_run, count_one_run, popcount, rank, iter_set, dumps, loads, to_hex)}
+
+
+#Seconds per call: timeit's autorange picks a loop count that runs for at least min_time, repeated `repeat` times.
+def _time(func, repeat, min_time):
+    timer = timeit.Timer(func)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time:
+            break
+        loops = loops * 10 if elapsed < min_time / 10 else max(loops + 1, int(loops * min_time / elapsed * 1.2))
+    runs = [elapsed] + timer.repeat(repeat - 1, loops) if repeat > 1 else [elapsed]
+    runs = [t / loops for t in runs]
+    return {'best': min(runs), 'median': statistics.median(runs), 'loops': loops}
+
+
+def run(sizes, densities, patterns=(), repeat=5, min_time=0.05, seed=0, log=None):
+    benches = _benchmarks()
+    if patterns:
+        benches = {name: f for name, f in benches.items() if any(p in name for p in patterns)}
+    results = []
+    for size in sizes:
+        for density in densities:
+            rnd = random.Random(seed)
+            a, b = _random_bits(size, density, rnd), _random_bits(size, density, rnd)
+            idx = [rnd.randrange(size) for _ in range(_POINT_OPS)] if size else []
+            for name, make in benches.items():
+                timing = _time(make(a.copy(), b, idx), repeat, min_time)
+                result = {'name': name, 'size': size, 'density': density, **timing}
+                results.append(result)
+                if log is not None:
+                    print(f"{_key(result):<55} {_format_seconds(timing['best']):>12}", file=log, flush=True)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def _key(result):
+    return f"{result['name']}[size={result['size']},density={result['density']}]"
+
+
+def _format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+#Compare best times of two runs; returns (lines of the report, number of regressions beyond threshold).
+def compare(baseline, current, threshold=0.10):
+    old = {_key(r): r['best'] for r in baseline['results']}
+    lines, regressions = [], 0
+    for result in current['results']:
+        key = _key(result)
+        if key not in old:
+            continue
+        ratio = result['best'] / old[key] if old[key] else float('inf')
+        if ratio > 1 + threshold:
+            status = 'SLOWER'
+            regressions += 1
+        elif ratio < 1 - threshold:
+            status = 'faster'
+        else:
+            status = ''
+        lines.append(f"{key:<55} {_format_seconds(old[key]):>12} {_format_seconds(result['best']):>12} {ratio:7.2f}x {status}")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bitarray_bench', description="BitArray benchmark suite")
+    parser.add_argument('--sizes', nargs='+', type=_parse_size, default=[_parse_size(s) for s in _DEFAULT_SIZES],
+                        help="array sizes in bits, K/M/G suffixes allowed (default: %(default)s)")
+    parser.add_argument('--densities', nargs='+', type=float, default=list(_DEFAULT_DENSITIES),
+                        help="fractions of 1 bits (default: %(default)s)")
+    parser.add_argument('--filter', action='append', default=[], help="only run benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05, help="minimum seconds per timed repetition")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    parser.add_argument('--compare', help="baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="relative slowdown reported as a regression")
+    parser.add_argument('--list', action='store_true', help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print('\n'.join(_benchmarks()))
+        return 0
+    if not all(0 <= d <= 1 for d in args.densities):
+        parser.error("densities must be between 0 and 1")
+
+    current = run(args.sizes, args.densities, args.filter, args.repeat, args.min_time, args.seed, log=sys.stdout)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines, regressions = compare(baseline, current, args.threshold)
+        print(f"\n{'benchmark':<55} {'baseline':>12} {'current':>12} {'ratio':>8}")
+        print('\n'.join(lines))
+        print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())